@@ -3,11 +3,14 @@ from typing import List
 from fastapi import APIRouter
 from fastapi import Depends
 from fastapi import HTTPException
+from fastapi import Query
 from fastapi import status
+from fastapi.responses import ORJSONResponse
 
 from src.database.models import Account
 from src.database.models import User
-from src.dependencies.auth_dependencies import get_current_user
+from src.dependencies.auth_dependencies import get_current_user_with_accounts
+from src.dependencies.auth_dependencies import require_admin
 from src.dependencies.basic_dependencies import get_account_service
 from src.schemas.schemas import ShowAccountSchema
 from src.services.services import AccountService
@@ -19,15 +22,32 @@ account_router: APIRouter = APIRouter(
     ],
 )
 
+admin_account_exception = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN, detail="Admin cannot have an account"
+)
+current_user_accounts_not_found_exception = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND, detail="The current user has no accounts"
+)
+user_accounts_not_found_exception = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND, detail="User with this id has no accounts"
+)
+admin_data_forbidden_exception = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN, detail="Admin cannot get another admin data"
+)
+user_not_found_exception = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND, detail="User with this id not found"
+)
+
 
-@account_router.get("/current-user", response_model=List[ShowAccountSchema])
+@account_router.get(
+    "/current-user", responses={200: {"model": List[ShowAccountSchema]}}
+)
 async def get_current_user_accounts(
-    user: User = Depends(get_current_user),
-    service: AccountService = Depends(get_account_service),
-) -> List[Account]:
+    user: User = Depends(get_current_user_with_accounts),
+) -> ORJSONResponse:
     """
     Обработчик, отвечающий за получение своих счетов текущим пользователем. Данные о пользователе берутся
-    из заголовков запроса
+    из заголовков запроса, а его счета загружаются тем же запросом к базе данных
 
     В случае, если запрос на получение своего счета пытается сделать администратор, возникает исключение с кодом 403
 
@@ -37,26 +57,30 @@ async def get_current_user_accounts(
     """
 
     if user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="Admin cannot have an account"
-        )
+        raise admin_account_exception.with_traceback(None)
 
-    accounts: List[Account] = await service.get_current_user_accounts(user=user)
+    accounts: List[Account] = user.accounts
     if not accounts:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="The current user has no accounts",
-        )
+        raise current_user_accounts_not_found_exception.with_traceback(None)
 
-    return accounts
+    return ORJSONResponse(
+        [
+            {"account_id": account.account_id, "balance": account.balance}
+            for account in accounts
+        ]
+    )
 
 
-@account_router.get("/", response_model=List[ShowAccountSchema])
+@account_router.get("/", responses={200: {"model": List[ShowAccountSchema]}})
 async def get_accounts_by_user_id(
     user_id: int,
-    user: User = Depends(get_current_user),
+    limit: int = Query(default=50, gt=0, le=500),
+    offset: int = Query(default=0, ge=0),
+    user: User = Depends(
+        require_admin(detail="Only admin can get another user accounts")
+    ),
     service: AccountService = Depends(get_account_service),
-) -> List[Account]:
+) -> ORJSONResponse:
     """
     Обработчик, отвечающий за получение счетов пользователя с указанным id администратором
 
@@ -66,30 +90,25 @@ async def get_accounts_by_user_id(
     В случае, если у пользователя с указанным id нет ни одного счета или пользователя с таким id не существует
     , то возникает исключение с кодом 404
 
-    В противном случае обработчик возвращает данные о счетах пользователя (их id и баланс)
+    В противном случае обработчик возвращает данные о счетах пользователя (их id и баланс).
+    Счета возвращаются постранично: limit задает размер страницы (не более 500), offset - смещение
     """
 
-    if not user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admin can get another user accounts",
-        )
     try:
-        accounts: List[Account] = await service.get_accounts_by_user_id(user_id=user_id)
+        accounts: List[Account] = await service.get_accounts_by_user_id(
+            user_id=user_id, limit=limit, offset=offset
+        )
         if not accounts:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User with this id has no accounts",
-            )
+            raise user_accounts_not_found_exception.with_traceback(None)
 
-        return accounts
+        return ORJSONResponse(
+            [
+                {"account_id": account.account_id, "balance": account.balance}
+                for account in accounts
+            ]
+        )
 
     except PermissionError:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin cannot get another admin data",
-        )
+        raise admin_data_forbidden_exception.with_traceback(None)
     except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User with this id not found"
-        )
+        raise user_not_found_exception.with_traceback(None)
@@ -1,9 +1,11 @@
 from typing import Dict
+from typing import Optional
 
 from fastapi import APIRouter
 from fastapi import Depends
 from fastapi import HTTPException
 from fastapi import status
+from fastapi.responses import ORJSONResponse
 
 from src.database.models import User
 from src.dependencies.auth_dependencies import get_current_user
@@ -20,12 +22,16 @@ auth_router: APIRouter = APIRouter(
     ],
 )
 
+incorrect_credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email or password"
+)
+
 
-@auth_router.post(path="/login", response_model=TokenSchema)
+@auth_router.post(path="/login", responses={200: {"model": TokenSchema}})
 async def login(
     body: OAuth2PasswordRequestFormEmail = Depends(),
     service: AuthService = Depends(get_auth_service),
-) -> TokenSchema:
+) -> ORJSONResponse:
     """
     Обработчик, отвечающий за вход пользователя в систему. На вход поступает электронная почта и пароль (электронная
     почта обозначена как username)
@@ -41,25 +47,22 @@ async def login(
         token_data: Dict[str, str] = await service.login(
             email=body.email, password=body.password
         )
-        return TokenSchema(**token_data)
+        return ORJSONResponse(token_data)
 
     except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password",
-        )
+        raise incorrect_credentials_exception.with_traceback(None)
 
 
-@auth_router.post(path="/refresh-token", response_model=TokenSchema)
+@auth_router.post(path="/refresh-token", responses={200: {"model": TokenSchema}})
 async def refresh_token(
     user: User = Depends(get_current_user),
     service: AuthService = Depends(get_auth_service),
-) -> TokenSchema:
+) -> ORJSONResponse:
     """
     Обработчик, возвращающий обновленный access token на основании refresh token'а. Refresh token берется
     из заголовка Authorization поступившего запроса
     """
 
-    token_data: Dict[str, str] = service.refresh_token(user=user)
+    token_data: Dict[str, Optional[str]] = service.refresh_token(user=user)
 
-    return TokenSchema(**token_data)
+    return ORJSONResponse(token_data)
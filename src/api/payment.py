@@ -1,14 +1,20 @@
 from typing import List
 
+import msgspec
+import orjson
 from fastapi import APIRouter
 from fastapi import Depends
 from fastapi import HTTPException
+from fastapi import Request
 from fastapi import status
-from starlette.responses import JSONResponse
+from fastapi.exceptions import RequestValidationError
+from fastapi.openapi.constants import REF_PREFIX
+from fastapi.responses import ORJSONResponse
+from starlette.responses import Response
 
-from src.api.user import get_current_user
 from src.database.models import Payment
 from src.database.models import User
+from src.dependencies.auth_dependencies import get_current_user
 from src.dependencies.basic_dependencies import get_payment_service
 from src.schemas.schemas import PaymentSchema
 from src.schemas.schemas import ShowPaymentSchema
@@ -21,12 +27,50 @@ payment_router: APIRouter = APIRouter(
     ],
 )
 
+admin_payments_exception = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN, detail="Admin cannot have payments"
+)
+payments_not_found_exception = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND, detail="User does not have payments"
+)
+admin_payment_forbidden_exception = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN,
+    detail="Cannot process a payment if the user is an admin",
+)
+
+# Нестрогий режим сохраняет приведение типов прежней pydantic схемы: например,
+# "user_id": "1" и "amount": "10" по-прежнему принимаются
+payment_decoder: msgspec.json.Decoder = msgspec.json.Decoder(
+    PaymentSchema, strict=False
+)
+
+_, _payment_schema_components = msgspec.json.schema_components(
+    [PaymentSchema], ref_template="#/components/schemas/{name}"
+)
+PAYMENT_REQUEST_BODY: dict = {
+    "required": True,
+    "content": {
+        "application/json": {"schema": _payment_schema_components["PaymentSchema"]}
+    },
+}
+
+PAYMENT_VALIDATION_ERROR_RESPONSE: dict = {
+    "description": "Validation Error",
+    "content": {
+        "application/json": {"schema": {"$ref": REF_PREFIX + "HTTPValidationError"}}
+    },
+}
+
+PAYMENT_PROCESSED_CONTENT: bytes = orjson.dumps(
+    {"message": "Payment was successfully processed"}
+)
+
 
-@payment_router.get("/", response_model=List[ShowPaymentSchema])
+@payment_router.get("/", responses={200: {"model": List[ShowPaymentSchema]}})
 async def get_payments(
     user: User = Depends(get_current_user),
     service: PaymentService = Depends(get_payment_service),
-) -> List[Payment]:
+) -> ORJSONResponse:
     """
     Обработчик, отвечающий за получение авторизованным пользователем связанных с собой платежей.
     Данные о пользователе берутся из заголовков запроса
@@ -39,26 +83,38 @@ async def get_payments(
     """
 
     if user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="Admin cannot have payments"
-        )
+        raise admin_payments_exception.with_traceback(None)
 
     payments: List[Payment] = await service.get_payments(user=user)
     if not payments:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User does not have payments"
-        )
-
-    return payments
-
-
-@payment_router.post("/")
+        raise payments_not_found_exception.with_traceback(None)
+
+    return ORJSONResponse(
+        [
+            {
+                "transaction_id": payment.transaction_id,
+                "account_id": payment.account_id,
+                "amount": payment.amount,
+            }
+            for payment in payments
+        ]
+    )
+
+
+@payment_router.post(
+    "/",
+    responses={422: PAYMENT_VALIDATION_ERROR_RESPONSE},
+    openapi_extra={"requestBody": PAYMENT_REQUEST_BODY},
+)
 async def process_payment(
-    body: PaymentSchema, service: PaymentService = Depends(get_payment_service)
-) -> JSONResponse:
+    request: Request, service: PaymentService = Depends(get_payment_service)
+) -> Response:
     """
     Обработчик, реализующий обработку поступившего платежа
 
+    Тело запроса декодируется и проверяется с помощью msgspec. В случае, если оно не соответствует
+    схеме PaymentSchema, возникает исключение с кодом 422
+
     В случае появления проблем, связанных с данными платежа, возникает исключение с кодом 400
 
     В случае, если пользователь, которому адресован платеж, является администратором, возникает исключение с кодом 403
@@ -66,18 +122,61 @@ async def process_payment(
     В противном случае транзакция выполняется, записывается в базу данных и возвращается сообщение о ее успешности
     """
 
+    body: PaymentSchema = _decode_payment(body=await request.body())
+
     try:
-        await service.process_payment(**body.model_dump())
-        return JSONResponse(
+        await service.process_payment(**msgspec.structs.asdict(body))
+        return Response(
             status_code=status.HTTP_200_OK,
-            content={"message": "Payment was successfully processed"},
+            content=PAYMENT_PROCESSED_CONTENT,
+            media_type="application/json",
         )
     except ValueError as exception:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(exception)
         )
     except PermissionError:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Cannot process a payment if the user is an admin",
+        raise admin_payment_forbidden_exception.with_traceback(None)
+
+
+def _decode_payment(body: bytes) -> PaymentSchema:
+    # Ошибки msgspec приводятся к формату ошибок валидации FastAPI, чтобы ответ
+    # с кодом 422 формировался стандартным обработчиком
+    if not body:
+        raise RequestValidationError(
+            [
+                {
+                    "type": "missing",
+                    "loc": ("body",),
+                    "msg": "Field required",
+                    "input": None,
+                }
+            ]
+        )
+
+    try:
+        return payment_decoder.decode(body)
+    except msgspec.ValidationError as exception:
+        message, _, path = str(exception).partition(" - at `$")
+        raise RequestValidationError(
+            [
+                {
+                    "type": "value_error",
+                    "loc": ("body", *filter(None, path.rstrip("`").split("."))),
+                    "msg": message,
+                    "input": None,
+                }
+            ]
+        )
+    except msgspec.DecodeError as exception:
+        raise RequestValidationError(
+            [
+                {
+                    "type": "json_invalid",
+                    "loc": ("body",),
+                    "msg": "JSON decode error",
+                    "input": {},
+                    "ctx": {"error": str(exception)},
+                }
+            ]
         )
@@ -1,14 +1,19 @@
 from typing import List
 
+import orjson
 from fastapi import APIRouter
 from fastapi import Depends
 from fastapi import HTTPException
+from fastapi import Query
 from fastapi import status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import RowMapping
 from sqlalchemy.exc import IntegrityError
-from starlette.responses import JSONResponse
+from starlette.responses import Response
 
 from src.database.models import User
 from src.dependencies.auth_dependencies import get_current_user
+from src.dependencies.auth_dependencies import require_admin
 from src.dependencies.basic_dependencies import get_user_service
 from src.schemas.schemas import ShowUserSchema
 from src.schemas.schemas import UserCreationSchema
@@ -22,13 +27,36 @@ user_router: APIRouter = APIRouter(
     ],
 )
 
+user_not_found_exception = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND, detail="User with this id not found"
+)
+admin_data_forbidden_exception = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN, detail="Admin cannot get another admin data"
+)
+admin_delete_forbidden_exception = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN, detail="Admin cannot delete another admin"
+)
+email_conflict_exception = HTTPException(
+    status_code=status.HTTP_409_CONFLICT, detail="User with this email already exists"
+)
+empty_update_exception = HTTPException(
+    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+    detail="At least one parameter must be provided",
+)
+admin_update_forbidden_exception = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN, detail="Admin cannot update another admin"
+)
+users_not_found_exception = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND, detail="No non-admin users"
+)
 
-@user_router.get("/", response_model=ShowUserSchema)
+
+@user_router.get("/", responses={200: {"model": ShowUserSchema}})
 async def get_user_by_id(
     user_id: int,
-    user: User = Depends(get_current_user),
+    user: User = Depends(require_admin(detail="Only admin can get user data")),
     service: UserService = Depends(get_user_service),
-) -> User:
+) -> ORJSONResponse:
     """
     Обработчик, отвечающий за получение пользователя по id
 
@@ -40,43 +68,33 @@ async def get_user_by_id(
     В противном случае, обработчик возвращает информацию о пользователе (id, почта, имя)
     """
 
-    if not user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="Only admin can get user data"
-        )
-
     try:
         user: User = await service.get_user(user_id=user_id)
-        return user
+        return _get_user_response(user=user)
     except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User with this id not found"
-        )
+        raise user_not_found_exception.with_traceback(None)
     except PermissionError:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin cannot get another admin data",
-        )
+        raise admin_data_forbidden_exception.with_traceback(None)
 
 
-@user_router.get("/current-user", response_model=ShowUserSchema)
-async def get_current_user(
+@user_router.get("/current-user", responses={200: {"model": ShowUserSchema}})
+async def get_current_user_data(
     user: User = Depends(get_current_user),
-) -> User:
+) -> ORJSONResponse:
     """
     Обработчик, отвечающий за получение данных текущего авторизованного пользователя. Получение информации происходит
     на основании заголовков запроса
     """
 
-    return user
+    return _get_user_response(user=user)
 
 
 @user_router.delete("/")
 async def delete_user(
     user_id: int,
-    user: User = Depends(get_current_user),
+    user: User = Depends(require_admin(detail="Only admin can delete users")),
     service: UserService = Depends(get_user_service),
-) -> JSONResponse:
+) -> Response:
     """
     Обработчик, отвечающий за удаление пользователя по id
 
@@ -89,34 +107,27 @@ async def delete_user(
     возвращается сообщение об этом
     """
 
-    if not user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="Only admin can delete users"
-        )
-
     try:
         await service.delete_user(user_id=user_id)
-        return JSONResponse(
+        return Response(
             status_code=status.HTTP_200_OK,
-            content={"message": f"User with {user_id} was successfully deleted"},
+            content=orjson.dumps(
+                {"message": f"User with {user_id} was successfully deleted"}
+            ),
+            media_type="application/json",
         )
     except PermissionError:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin cannot delete another admin",
-        )
+        raise admin_delete_forbidden_exception.with_traceback(None)
     except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User with this id not found"
-        )
+        raise user_not_found_exception.with_traceback(None)
 
 
-@user_router.post("/", response_model=ShowUserSchema)
+@user_router.post("/", responses={200: {"model": ShowUserSchema}})
 async def create_user(
     body: UserCreationSchema,
-    user: User = Depends(get_current_user),
+    user: User = Depends(require_admin(detail="Only admin can create users")),
     service: UserService = Depends(get_user_service),
-) -> User:
+) -> ORJSONResponse:
     """
     Обработчик, отвечающий за создание пользователя
 
@@ -128,30 +139,23 @@ async def create_user(
     обработчиком
     """
 
-    if not user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="Only admin can create users"
-        )
     try:
         new_user: User = await service.create_user(
             full_name=body.full_name, email=body.email, password=body.password1
         )
-        return new_user
+        return _get_user_response(user=new_user)
 
     except IntegrityError:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="User with this email already exists",
-        )
+        raise email_conflict_exception.with_traceback(None)
 
 
-@user_router.patch("/", response_model=ShowUserSchema)
+@user_router.patch("/", responses={200: {"model": ShowUserSchema}})
 async def update_user(
     user_id: int,
     body: UserUpdateSchema,
-    user: User = Depends(get_current_user),
+    user: User = Depends(require_admin(detail="Only admin can update users")),
     service: UserService = Depends(get_user_service),
-) -> User:
+) -> ORJSONResponse:
     """
     Обработчик, отвечающий за обновление информации о пользователе
 
@@ -168,44 +172,32 @@ async def update_user(
     В случае, если никаких исключений не возникло, обработчик возвращает обновленную информацию о пользователе
     """
 
-    if not user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="Only admin can update users"
-        )
-
-    parameters_for_update = body.model_dump(exclude_none=True)
+    parameters_for_update = {
+        field: value for field, value in body.__dict__.items() if value is not None
+    }
     if not parameters_for_update:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="At least one parameter must be provided",
-        )
+        raise empty_update_exception.with_traceback(None)
 
     try:
         updated_user: User = await service.update_user(
             user_id=user_id, parameters_for_update=parameters_for_update
         )
-        return updated_user
+        return _get_user_response(user=updated_user)
     except IntegrityError:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="User with this email already exists",
-        )
+        raise email_conflict_exception.with_traceback(None)
     except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User with this id not found"
-        )
+        raise user_not_found_exception.with_traceback(None)
     except PermissionError:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin cannot update another admin",
-        )
+        raise admin_update_forbidden_exception.with_traceback(None)
 
 
-@user_router.get("/list-of-users", response_model=List[ShowUserSchema])
+@user_router.get("/list-of-users", responses={200: {"model": List[ShowUserSchema]}})
 async def get_users(
-    user: User = Depends(get_current_user),
+    after_id: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, gt=0, le=500),
+    user: User = Depends(require_admin(detail="Only admin can get list of users")),
     service: UserService = Depends(get_user_service),
-) -> List[User]:
+) -> ORJSONResponse:
     """
     Обработчик, возвращающий список всех пользователей (не являющихся администраторами)
 
@@ -214,20 +206,21 @@ async def get_users(
     В случае, если не существует ни одного пользователя, не являющегося администратором, возникает исключение с
     кодом 404
 
-    В противном случае возвращается список с информацией о пользователях (id, почта, имя)
+    В противном случае возвращается список с информацией о пользователях (id, почта, имя).
+    Пользователи возвращаются постранично в порядке возрастания id: limit задает размер
+    страницы (не более 500), after_id - id последнего пользователя предыдущей страницы
     """
 
-    if not user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admin can get list of users",
-        )
-
-    users: List[User] = await service.get_users()
+    users: List[RowMapping] = await service.get_users(after_id=after_id, limit=limit)
 
     if not users:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="No non-admin users"
-        )
+        raise users_not_found_exception.with_traceback(None)
+
+    return ORJSONResponse([dict(row) for row in users])
+
 
-    return users
+def _get_user_response(user: User) -> ORJSONResponse:
+    # Данные пользователя сериализуются напрямую, без построения ShowUserSchema
+    return ORJSONResponse(
+        {"user_id": user.user_id, "email": user.email, "full_name": user.full_name}
+    )
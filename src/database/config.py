@@ -3,6 +3,7 @@ import os
 from pydantic_settings import BaseSettings
 from pydantic_settings import SettingsConfigDict
 from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.ext.asyncio import create_async_engine
 
 
@@ -16,6 +17,12 @@ class DatabaseSettings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
 
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 10
+    DB_POOL_RECYCLE: int = 1800
+    DB_ECHO: bool = False
+
     @property
     def ASYNC_DATABASE_URL(self):
         return (
@@ -23,14 +30,6 @@ class DatabaseSettings(BaseSettings):
             f"{self.DB_HOST}:{self.EXTERNAL_DB_PORT}/{self.POSTGRES_DB}"
         )
 
-    @property
-    def _async_engine(self):
-        return create_async_engine(url=self.ASYNC_DATABASE_URL, future=True, echo=True)
-
-    @property
-    def async_session(self):
-        return async_sessionmaker(self._async_engine, expire_on_commit=False)
-
     model_config = SettingsConfigDict(
         env_file=os.path.join(
             os.path.dirname(
@@ -43,3 +42,20 @@ class DatabaseSettings(BaseSettings):
 
 
 database_settings = DatabaseSettings()
+
+# Движок и фабрика сессий создаются один раз на процесс, чтобы все запросы
+# использовали общий пул соединений
+async_engine: AsyncEngine = create_async_engine(
+    url=database_settings.ASYNC_DATABASE_URL,
+    future=True,
+    echo=database_settings.DB_ECHO,
+    pool_size=database_settings.DB_POOL_SIZE,
+    max_overflow=database_settings.DB_MAX_OVERFLOW,
+    pool_timeout=database_settings.DB_POOL_TIMEOUT,
+    pool_recycle=database_settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+)
+
+async_session: async_sessionmaker = async_sessionmaker(
+    async_engine, expire_on_commit=False, autoflush=False
+)
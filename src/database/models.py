@@ -2,7 +2,10 @@ from typing import List
 from uuid import UUID
 
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
@@ -28,6 +31,14 @@ class User(Base):
     """
 
     __tablename__ = "user"
+    __table_args__ = (
+        Index(
+            "ix_user_non_admin",
+            "user_id",
+            postgresql_where=text("is_admin = false"),
+            postgresql_include=["email", "full_name"],
+        ),
+    )
 
     user_id: Mapped[int] = mapped_column(Integer, primary_key=True)
     email: Mapped[str] = mapped_column(unique=True)
@@ -56,7 +67,7 @@ class Account(Base):
 
     account_id: Mapped[int] = mapped_column(Integer, primary_key=True)
     balance: Mapped[float] = mapped_column(default=0)
-    user_id: Mapped[int] = mapped_column(ForeignKey("user.user_id"))
+    user_id: Mapped[int] = mapped_column(ForeignKey("user.user_id"), index=True)
     user: Mapped["User"] = relationship(back_populates="accounts")
     payments: Mapped[List["Payment"]] = relationship(
         back_populates="account", cascade="all, delete-orphan"
@@ -77,9 +88,22 @@ class Payment(Base):
     """
 
     __tablename__ = "payment"
+    __table_args__ = (
+        Index(
+            "ix_payment_account_amount",
+            "account_id",
+            "amount",
+            postgresql_include=["transaction_id"],
+        ),
+        Index(
+            "ix_payment_transaction_id_hash",
+            "transaction_id",
+            postgresql_using="hash",
+        ),
+    )
 
     payment_id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    transaction_id: Mapped[UUID] = mapped_column(unique=True)
+    transaction_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), unique=True)
     amount: Mapped[float]
     account_id: Mapped[int] = mapped_column(ForeignKey("account.account_id"))
     account: Mapped["Account"] = relationship(back_populates="payments")
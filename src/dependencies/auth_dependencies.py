@@ -1,48 +1,114 @@
+from typing import Awaitable
+from typing import Callable
 from typing import Optional
+from typing import Tuple
 
 from fastapi import Depends
 from fastapi import HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError
+from jwt import PyJWTError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from starlette import status
 
+from src.database.config import async_session
 from src.database.models import User
-from src.dependencies.basic_dependencies import get_db_session
+from src.dependencies import token_cache
 from src.services import security
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Исключения со статичным текстом создаются один раз на уровне модуля. При возбуждении
+# у них сбрасывается трассировка, иначе она накапливалась бы от запроса к запросу
 credentials_exception = HTTPException(
     status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials"
 )
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db_session: AsyncSession = Depends(get_db_session),
-) -> User:
-    try:
-        email: Optional[str] = security.get_email_from_jwt_token(token=token)
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+    token_key: bytes = token_cache.get_token_key(token=token)
+    user: Optional[User] = token_cache.get_cached_user(token_key=token_key)
+    if user is not None:
+        return user
 
-    user: Optional[User] = await _get_user_by_email_from_database(
-        email=email, db_session=db_session
-    )
+    email, expires_at = _get_email_and_expiration_from_token(token=token)
+    async with async_session() as db_session:
+        user_fields = await _get_user_fields_by_email_from_database(
+            email=email, db_session=db_session
+        )
+    if user_fields is None:
+        raise credentials_exception.with_traceback(None)
+
+    if expires_at is not None:
+        token_cache.cache_user(
+            token_key=token_key, user_fields=user_fields, expires_at=expires_at
+        )
+    return token_cache.build_user(user_fields=user_fields)
+
+
+async def get_current_user_with_accounts(token: str = Depends(oauth2_scheme)) -> User:
+    email, _ = _get_email_and_expiration_from_token(token=token)
+    async with async_session() as db_session:
+        user: Optional[User] = await _get_user_with_accounts_by_email_from_database(
+            email=email, db_session=db_session
+        )
     if user is None:
-        raise credentials_exception
+        raise credentials_exception.with_traceback(None)
 
     return user
 
 
-async def _get_user_by_email_from_database(
+def require_admin(detail: str) -> Callable[..., Awaitable[User]]:
+    """
+    Создает зависимость, пропускающую к обработчику только администратора. Проверка
+    выполняется до разрешения остальных зависимостей обработчика, поэтому при отказе
+    сервис и сессия базы данных не создаются
+    """
+
+    forbidden_exception = HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN, detail=detail
+    )
+
+    async def get_current_admin(user: User = Depends(get_current_user)) -> User:
+        if not user.is_admin:
+            raise forbidden_exception.with_traceback(None)
+
+        return user
+
+    return get_current_admin
+
+
+def _get_email_and_expiration_from_token(token: str) -> Tuple[str, Optional[float]]:
+    try:
+        email, expires_at = security.get_email_and_expiration_from_jwt_token(
+            token=token
+        )
+        if email is None:
+            raise credentials_exception.with_traceback(None)
+    except PyJWTError:
+        raise credentials_exception.with_traceback(None)
+
+    return email, expires_at
+
+
+async def _get_user_fields_by_email_from_database(
+    email: str, db_session: AsyncSession
+) -> Optional[token_cache.UserFields]:
+    result = await db_session.execute(
+        select(User.user_id, User.email, User.full_name, User.is_admin).filter_by(
+            email=email
+        )
+    )
+    row = result.first()
+    return None if row is None else tuple(row)
+
+
+async def _get_user_with_accounts_by_email_from_database(
     email: str, db_session: AsyncSession
 ) -> Optional[User]:
-    async with db_session.begin():
-        result = await db_session.execute(select(User).filter_by(email=email))
-        return result.scalars().first()
+    result = await db_session.execute(
+        select(User).options(joinedload(User.accounts)).filter_by(email=email)
+    )
+    return result.unique().scalars().first()
@@ -1,7 +1,7 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.config import database_settings
+from src.database.config import async_session
 from src.services.services import AccountService
 from src.services.services import AuthService
 from src.services.services import PaymentService
@@ -9,28 +9,29 @@ from src.services.services import UserService
 
 
 async def get_db_session() -> AsyncSession:
-    try:
-        session: AsyncSession = database_settings.async_session()
+    async with async_session() as session:
         yield session
-    finally:
-        await session.close()
 
 
-def get_user_service(db_session: AsyncSession = Depends(get_db_session)) -> UserService:
+async def get_user_service(
+    db_session: AsyncSession = Depends(get_db_session),
+) -> UserService:
     return UserService(db_session=db_session)
 
 
-def get_auth_service(db_session: AsyncSession = Depends(get_db_session)) -> AuthService:
+async def get_auth_service(
+    db_session: AsyncSession = Depends(get_db_session),
+) -> AuthService:
     return AuthService(db_session=db_session)
 
 
-def get_account_service(
+async def get_account_service(
     db_session: AsyncSession = Depends(get_db_session),
 ) -> AccountService:
     return AccountService(db_session=db_session)
 
 
-def get_payment_service(
+async def get_payment_service(
     db_session: AsyncSession = Depends(get_db_session),
 ) -> PaymentService:
     return PaymentService(db_session=db_session)
@@ -0,0 +1,65 @@
+import hashlib
+import time
+from typing import Optional
+from typing import Tuple
+
+from cachetools import TLRUCache
+
+from src.database.models import User
+from src.settings import project_settings
+
+
+TOKEN_CACHE_MAX_SIZE: int = 10_000
+TOKEN_CACHE_TTL: int = 60
+
+# Кэш хранится в памяти процесса, и при изменении или удалении пользователя записи
+# удаляются только в том процессе, который выполнил запрос. Поэтому кэш используется,
+# лишь когда приложение запущено в одном процессе
+TOKEN_CACHE_ENABLED: bool = project_settings.APP_WORKERS == 1
+
+# Вместо ORM объекта, привязанного к сессии, хранятся только поля пользователя:
+# user_id, email, full_name и is_admin
+UserFields = Tuple[int, str, str, bool]
+
+
+def _get_time_to_use(key: bytes, value: Tuple[UserFields, float], now: float) -> float:
+    # Запись живет не дольше самого токена и не дольше TOKEN_CACHE_TTL секунд
+    _, expires_at = value
+    return min(expires_at, now + TOKEN_CACHE_TTL)
+
+
+token_cache: TLRUCache = TLRUCache(
+    maxsize=TOKEN_CACHE_MAX_SIZE, ttu=_get_time_to_use, timer=time.time
+)
+
+
+def get_token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def get_cached_user(token_key: bytes) -> Optional[User]:
+    if not TOKEN_CACHE_ENABLED:
+        return None
+
+    cached: Optional[Tuple[UserFields, float]] = token_cache.get(token_key)
+    if cached is None:
+        return None
+
+    return build_user(user_fields=cached[0])
+
+
+def cache_user(token_key: bytes, user_fields: UserFields, expires_at: float) -> None:
+    if TOKEN_CACHE_ENABLED:
+        token_cache[token_key] = (user_fields, expires_at)
+
+
+def build_user(user_fields: UserFields) -> User:
+    """Создает не привязанный к сессии объект пользователя из сохраненных полей"""
+    user_id, email, full_name, is_admin = user_fields
+    return User(user_id=user_id, email=email, full_name=full_name, is_admin=is_admin)
+
+
+def invalidate_user(user_id: int) -> None:
+    for token_key, (user_fields, _) in list(token_cache.items()):
+        if user_fields[0] == user_id:
+            token_cache.pop(token_key, None)
@@ -1,6 +1,7 @@
 import uvicorn
 from fastapi import APIRouter
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from src.api.account import account_router
 from src.api.auth import auth_router
@@ -9,7 +10,9 @@ from src.api.user import user_router
 from src.settings import project_settings
 
 
-app: FastAPI = FastAPI(title=project_settings.APP_TITLE)
+app: FastAPI = FastAPI(
+    title=project_settings.APP_TITLE, default_response_class=ORJSONResponse
+)
 
 
 main_router: APIRouter = APIRouter(prefix="/api")
@@ -23,4 +26,16 @@ app.include_router(main_router)
 
 
 if __name__ == "__main__":
-    uvicorn.run(app=app, host=project_settings.APP_HOST, port=project_settings.APP_PORT)
+    # Для запуска нескольких процессов приложение передается строкой импорта.
+    # Цикл событий uvloop выбирается автоматически, если он установлен (на Windows
+    # он не поддерживается). Журнал доступа отключен, так как форматирование записи
+    # выполняется на каждый запрос
+    uvicorn.run(
+        app="src.main:app",
+        host=project_settings.APP_HOST,
+        port=project_settings.APP_PORT,
+        workers=project_settings.APP_WORKERS,
+        loop="auto",
+        http="httptools",
+        access_log=False,
+    )
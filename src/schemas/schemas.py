@@ -1,15 +1,24 @@
+from typing import Annotated
 from typing import Optional
 from uuid import UUID
 
+import msgspec
 from fastapi import Form
 from pydantic import BaseModel
 from pydantic import ConfigDict
 from pydantic import EmailStr
-from pydantic import Field
+from pydantic import StringConstraints
 
 from src.schemas.mixins import UserValidationMixin
 
 
+# Ограничения полного имени проверяются pydantic-core без вызова Python валидатора
+FullName = Annotated[
+    str,
+    StringConstraints(min_length=1, max_length=20, pattern=r"^[а-яА-Яa-zA-Z\- ]+$"),
+]
+
+
 class OAuth2PasswordRequestFormEmail:
     """
     Схема, используемая для входа пользователя в систему
@@ -75,7 +84,7 @@ class UserCreationSchema(UserValidationMixin, BaseModel):
     """
 
     email: EmailStr
-    full_name: str
+    full_name: FullName
     password1: str
     password2: str
 
@@ -92,7 +101,7 @@ class UserUpdateSchema(UserValidationMixin, BaseModel):
     """
 
     email: Optional[EmailStr] = None
-    full_name: Optional[str] = None
+    full_name: Optional[FullName] = None
     password1: Optional[str] = None
     password2: Optional[str] = None
 
@@ -110,9 +119,10 @@ class ShowAccountSchema(BaseModel):
     balance: float
 
 
-class PaymentSchema(BaseModel):
+class PaymentSchema(msgspec.Struct):
     """
-    Схема, представляющая данные платежа
+    Схема, представляющая данные платежа. Реализована через msgspec, так как тело
+    платежа декодируется и проверяется на каждом запросе к обработчику платежей
 
     Атрибуты:
     transaction_id (UUID): Уникальный идентификатор транзакции в “сторонней системе”;
@@ -124,8 +134,8 @@ class PaymentSchema(BaseModel):
 
     transaction_id: UUID
     user_id: int
-    account_id: int = Field(..., gt=0)
-    amount: float = Field(..., gt=0.0)
+    account_id: Annotated[int, msgspec.Meta(gt=0)]
+    amount: Annotated[float, msgspec.Meta(gt=0.0)]
     signature: str
 
 
@@ -0,0 +1,32 @@
+from cachetools import TTLCache
+
+from src.settings import project_settings
+
+
+FAILED_LOGIN_CACHE_MAX_SIZE: int = 10_000
+FAILED_LOGIN_CACHE_TTL: int = 5
+
+# Неудачные попытки входа в виде пар (почта, отпечаток пароля). Повтор такой же попытки
+# в течение TTL отклоняется без обращения к базе данных и без вычисления bcrypt
+failed_logins: TTLCache = TTLCache(
+    maxsize=FAILED_LOGIN_CACHE_MAX_SIZE, ttl=FAILED_LOGIN_CACHE_TTL
+)
+
+VERIFIED_PASSWORD_CACHE_MAX_SIZE: int = 10_000
+VERIFIED_PASSWORD_CACHE_TTL: int = 60
+
+# Успешные проверки паролей в виде пар (хэш пароля, отпечаток пароля). Смена пароля
+# меняет хэш, поэтому устаревшая запись не может подтвердить старый пароль
+verified_passwords: TTLCache = TTLCache(
+    maxsize=VERIFIED_PASSWORD_CACHE_MAX_SIZE, ttl=VERIFIED_PASSWORD_CACHE_TTL
+)
+
+USER_CACHE_MAX_SIZE: int = 10_000
+USER_CACHE_TTL: int = 30
+
+# Поля пользователей (user_id, email, full_name, is_admin) по их идентификаторам.
+# Кэш хранится в памяти процесса, и при изменении или удалении пользователя запись
+# удаляется только в том процессе, который выполнил запрос. Поэтому кэш используется,
+# лишь когда приложение запущено в одном процессе
+USER_CACHE_ENABLED: bool = project_settings.APP_WORKERS == 1
+users_by_id: TTLCache = TTLCache(maxsize=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL)
@@ -3,13 +3,19 @@ from typing import List
 from typing import Optional
 from uuid import UUID
 
+from sqlalchemy import exists
+from sqlalchemy import Row
+from sqlalchemy import RowMapping
 from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm import selectinload
 
 from src.database.models import Account
 from src.database.models import Payment
 from src.database.models import User
-from src.services import hashing
 
 
 class BaseDAL:
@@ -18,6 +24,8 @@ class BaseDAL:
     (то есть классов, необходимых для работы с базой данных)
     """
 
+    __slots__ = ("db_session",)
+
     def __init__(self, db_session: AsyncSession) -> None:
         self.db_session: AsyncSession = db_session
 
@@ -25,92 +33,135 @@ class BaseDAL:
 class UserDAL(BaseDAL):
     """DAL класс для работы с пользовательскими данными"""
 
+    __slots__ = ()
+
     async def get_user_by_email(self, email: str) -> Optional[User]:
-        async with self.db_session.begin():
-            result = await self.db_session.execute(select(User).filter_by(email=email))
-            return result.scalars().first()
-
-    async def get_user_by_id(self, user_id: int) -> Optional[User]:
-        async with self.db_session.begin():
-            result = await self.db_session.execute(
-                select(User).filter_by(user_id=user_id)
+        result = await self.db_session.execute(select(User).filter_by(email=email))
+        return result.scalars().first()
+
+    async def get_user_by_id(
+        self, user_id: int, with_accounts_and_payments: bool = False
+    ) -> Optional[User]:
+        query = select(User).filter_by(user_id=user_id)
+        if with_accounts_and_payments:
+            # Счета и платежи загружаются двумя дополнительными запросами вместо
+            # отдельного запроса платежей для каждого счета
+            query = query.options(
+                selectinload(User.accounts).selectinload(Account.payments)
             )
-            return result.scalars().first()
+
+        result = await self.db_session.execute(query)
+        return result.scalars().first()
 
     async def delete_user(self, user: User) -> None:
-        async with self.db_session.begin():
-            await self.db_session.delete(user)
-
-    async def create_user(self, full_name: str, email: str, password: str) -> User:
-        async with self.db_session.begin():
-            user: User = User(
-                full_name=full_name,
-                email=email,
-                hashed_password=hashing.get_password_hash(password),
-            )
-            self.db_session.add(user)
-            await self.db_session.flush()
+        await self.db_session.delete(user)
+
+    async def create_user(
+        self, full_name: str, email: str, hashed_password: str
+    ) -> User:
+        user: User = User(
+            full_name=full_name,
+            email=email,
+            hashed_password=hashed_password,
+        )
+        self.db_session.add(user)
+        await self.db_session.flush()
 
-            return user
+        return user
 
     async def update_user(
-        self, user: User, parameters_for_update: Dict[str, str]
-    ) -> None:
-        async with self.db_session.begin():
-            if (full_name := parameters_for_update.get("full_name", None)) is not None:
-                setattr(user, "full_name", full_name)
-            if (email := parameters_for_update.get("email", None)) is not None:
-                setattr(user, "email", email)
-            if (password := parameters_for_update.get("password1", None)) is not None:
-                setattr(user, "hashed_password", hashing.get_password_hash(password))
-
-    async def get_users(self) -> List[User]:
-        async with self.db_session.begin():
-            result = await self.db_session.execute(
-                select(User).filter_by(is_admin=False)
-            )
-            return result.scalars().all()
+        self, user_id: int, values_for_update: Dict[str, str]
+    ) -> Optional[User]:
+        # Пользователь обновляется одним запросом без предварительной загрузки.
+        # Администраторы не обновляются, в этом случае возвращается None
+        result = await self.db_session.execute(
+            update(User)
+            .where(User.user_id == user_id, User.is_admin == False)
+            .values(**values_for_update)
+            .returning(User)
+        )
+        return result.scalars().first()
+
+    async def get_users(self, after_id: int, limit: int) -> List[RowMapping]:
+        # Постраничная выборка по ключу использует индекс ix_user_non_admin и не
+        # просматривает пропущенные строки, в отличие от OFFSET
+        result = await self.db_session.execute(
+            select(User.user_id, User.email, User.full_name)
+            .where(User.is_admin == False, User.user_id > after_id)
+            .order_by(User.user_id)
+            .limit(limit)
+        )
+        return result.mappings().all()
 
 
 class AccountDAL(BaseDAL):
     """DAL класс для доступа к данным о счетах пользователя"""
 
-    async def get_accounts_by_user_id(self, user_id: int) -> List[Account]:
-        async with self.db_session.begin():
-            result = await self.db_session.execute(
-                select(Account).filter_by(user_id=user_id)
-            )
-            return result.scalars().all()
-
-    async def get_account_by_id(self, account_id: int) -> Optional[Account]:
-        async with self.db_session.begin():
-            result = await self.db_session.execute(
-                select(Account).filter_by(account_id=account_id)
-            )
-            return result.scalars().first()
-
-    async def create_account(self, account_id: int, user_id: int) -> Account:
-        async with self.db_session.begin():
-            account: Account = Account(user_id=user_id, account_id=account_id)
-            self.db_session.add(account)
-            await self.db_session.flush()
+    __slots__ = ()
 
-            return account
+    async def get_accounts_by_user_id(
+        self, user_id: int, limit: int, offset: int
+    ) -> List[Account]:
+        result = await self.db_session.execute(
+            select(Account)
+            .filter_by(user_id=user_id)
+            .order_by(Account.account_id)
+            .limit(limit)
+            .offset(offset)
+        )
+        return result.scalars().all()
 
-    async def change_balance(self, account: Account, amount: float) -> None:
-        async with self.db_session.begin():
-            setattr(account, "balance", account.balance + amount)
+    async def get_account_by_id(self, account_id: int) -> Optional[Account]:
+        result = await self.db_session.execute(
+            select(Account).filter_by(account_id=account_id)
+        )
+        return result.scalars().first()
+
+    async def add_to_balance(
+        self, account_id: int, user_id: int, amount: float
+    ) -> bool:
+        # Новый счет создается с начальным балансом, а существующий пополняется тем же
+        # запросом. Счет другого пользователя не изменяется, тогда возвращается False
+        insert_query = pg_insert(Account).values(
+            account_id=account_id, user_id=user_id, balance=amount
+        )
+        result = await self.db_session.execute(
+            insert_query.on_conflict_do_update(
+                index_elements=[Account.account_id],
+                set_={"balance": Account.balance + insert_query.excluded.balance},
+                where=Account.user_id == user_id,
+            ).returning(Account.account_id)
+        )
+        return result.first() is not None
 
 
 class PaymentDAL(BaseDAL):
     """DAL класс для доступа к данным о платежах"""
 
-    async def get_payment(self, transaction_id: UUID) -> Optional[Payment]:
-        async with self.db_session.begin():
-            result = await self.db_session.execute(
-                select(Payment).filter_by(transaction_id=transaction_id)
+    __slots__ = ()
+
+    async def get_payment_preconditions(
+        self, transaction_id: UUID, user_id: int, account_id: int
+    ) -> Row:
+        # Данные для проверки платежа получаются одним запросом: признак
+        # администратора (None, если пользователя нет), владелец счета (None, если
+        # счета нет) и наличие платежа с таким transaction_id
+        result = await self.db_session.execute(
+            select(
+                select(User.is_admin)
+                .where(User.user_id == user_id)
+                .scalar_subquery()
+                .label("user_is_admin"),
+                select(Account.user_id)
+                .where(Account.account_id == account_id)
+                .scalar_subquery()
+                .label("account_user_id"),
+                exists()
+                .where(Payment.transaction_id == transaction_id)
+                .label("payment_exists"),
             )
-            return result.scalars().first()
+        )
+        return result.one()
 
     async def add_payment_to_database(
         self,
@@ -118,22 +169,30 @@ class PaymentDAL(BaseDAL):
         account_id: int,
         amount: float,
         signature: str,
-    ) -> None:
-        async with self.db_session.begin():
-            payment: Payment = Payment(
+    ) -> bool:
+        # Уникальность transaction_id обеспечивается базой данных, поэтому
+        # одновременные платежи с одним идентификатором не будут записаны дважды.
+        # Если платеж уже существует, возвращается False
+        result = await self.db_session.execute(
+            pg_insert(Payment)
+            .values(
                 transaction_id=transaction_id,
                 account_id=account_id,
                 amount=amount,
                 signature=signature,
             )
-            self.db_session.add(payment)
-            await self.db_session.flush()
-
-    async def get_payments_by_account_id(
-        self, account_id: int
-    ) -> Optional[List[Payment]]:
-        async with self.db_session.begin():
-            result = await self.db_session.execute(
-                select(Payment).filter_by(account_id=account_id)
+            .on_conflict_do_nothing(index_elements=[Payment.transaction_id])
+            .returning(Payment.payment_id)
+        )
+        return result.first() is not None
+
+    async def get_payments_by_user_id(self, user_id: int) -> List[Payment]:
+        result = await self.db_session.execute(
+            select(Payment)
+            .join(Account, Payment.account_id == Account.account_id)
+            .where(Account.user_id == user_id)
+            .options(
+                load_only(Payment.transaction_id, Payment.account_id, Payment.amount)
             )
-            return result.scalars().all()
+        )
+        return result.scalars().all()
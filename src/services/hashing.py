@@ -1,37 +1,87 @@
 import hashlib
+import hmac
+from typing import Optional
+from typing import Tuple
 
+from anyio import to_thread
 from passlib.context import CryptContext
 
+from src.services import caching
 from src.settings import project_settings
 
+# Новые пароли хэшируются argon2id, bcrypt оставлен для проверки уже сохраненных хэшей
 pwd_context: CryptContext = CryptContext(
     schemes=[
+        "argon2",
         "bcrypt",
     ],
     deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
 )
 
+SIGNATURE_SECRET_KEY: bytes = project_settings.SECRET_KEY.encode("utf-8")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+# Ключ для быстрых отпечатков паролей. Ключ blake2b ограничен 64 байтами, поэтому
+# он выводится из SECRET_KEY произвольной длины
+PASSWORD_FINGERPRINT_KEY: bytes = hashlib.sha256(
+    project_settings.SECRET_KEY.encode("utf-8")
+).digest()
 
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    verification_key: Tuple[str, bytes] = (
+        hashed_password,
+        get_password_fingerprint(password=plain_password),
+    )
+    if verification_key in caching.verified_passwords:
+        return True
+
+    # Проверка хэша занимает процессор надолго, поэтому выполняется вне цикла событий
+    is_verified: bool = await to_thread.run_sync(
+        pwd_context.verify, plain_password, hashed_password
+    )
+    if is_verified:
+        caching.verified_passwords[verification_key] = True
+
+    return is_verified
+
+
+async def get_password_hash(password: str) -> str:
+    return await to_thread.run_sync(pwd_context.hash, password)
+
+
+def get_password_fingerprint(password: str) -> bytes:
+    return hashlib.blake2b(
+        password.encode("utf-8"), digest_size=16, key=PASSWORD_FINGERPRINT_KEY
+    ).digest()
 
 
 def verify_signature(data: dict) -> bool:
-    received_signature = data.get("signature", None)
-    return received_signature == _generate_signature(data)
+    received_signature: Optional[str] = data.get("signature", None)
+    if received_signature is None:
+        return False
+
+    return hmac.compare_digest(
+        received_signature.encode("utf-8"), _generate_signature(data).encode("utf-8")
+    )
 
 
 def _generate_signature(data: dict) -> str:
-    data.pop("signature", None)
-    if (amount := data.get("amount")) % 1 == 0:
-        data["amount"] = int(amount)
+    # Значения подаются в хэш по одному в порядке сортировки ключей, что эквивалентно
+    # хэшированию их конкатенации с секретным ключом, но без построения общей строки
+    hasher = hashlib.sha256()
+    for key in sorted(data.keys()):
+        if key == "signature":
+            continue
+
+        value = data[key]
+        if key == "amount" and value % 1 == 0:
+            value = int(value)
 
-    concatenated_values = "".join(str(data[key]) for key in sorted(data.keys()))
-    concatenated_values += project_settings.SECRET_KEY
+        hasher.update(str(value).encode("utf-8"))
 
-    signature = hashlib.sha256(concatenated_values.encode("utf-8")).hexdigest()
-    return signature
+    hasher.update(SIGNATURE_SECRET_KEY)
+    return hasher.hexdigest()
@@ -1,24 +1,54 @@
-from datetime import datetime
+import base64
+import hashlib
+import hmac
+import time
 from datetime import timedelta
 from typing import Optional
+from typing import Tuple
 
-from jose import jwt
+import jwt
+import orjson
 
 from src.settings import project_settings
 
 
+def _encode_jwt_segment(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# Заголовок токена и ключ HMAC не меняются во время работы приложения, поэтому
+# для HS256 они подготавливаются один раз, а при создании токена подписывается
+# только новая полезная нагрузка
+JWT_HEADER_SEGMENT: bytes = _encode_jwt_segment(
+    orjson.dumps({"alg": project_settings.ALGORITHM, "typ": "JWT"})
+)
+JWT_HMAC: hmac.HMAC = hmac.new(
+    project_settings.SECRET_KEY.encode("utf-8"), digestmod=hashlib.sha256
+)
+
+
 def create_jwt_token(email: str, exp_timedelta: timedelta) -> str:
-    data: dict = {"sub": email}
+    expire: int = int(time.time() + exp_timedelta.total_seconds())
+    data: dict = {"sub": email, "exp": expire}
 
-    expire: datetime = datetime.utcnow() + exp_timedelta
-    data.update({"exp": expire})
+    if project_settings.ALGORITHM != "HS256":
+        return jwt.encode(
+            data, project_settings.SECRET_KEY, algorithm=project_settings.ALGORITHM
+        )
 
-    return jwt.encode(
-        data, project_settings.SECRET_KEY, algorithm=project_settings.ALGORITHM
+    signing_input: bytes = (
+        JWT_HEADER_SEGMENT + b"." + _encode_jwt_segment(orjson.dumps(data))
     )
+    token_hmac: hmac.HMAC = JWT_HMAC.copy()
+    token_hmac.update(signing_input)
+    signature: bytes = _encode_jwt_segment(token_hmac.digest())
+
+    return (signing_input + b"." + signature).decode("ascii")
 
 
-def get_email_from_jwt_token(token: str) -> Optional[str]:
+def get_email_and_expiration_from_jwt_token(
+    token: str,
+) -> Tuple[Optional[str], Optional[float]]:
     payload: dict = jwt.decode(
         token,
         project_settings.SECRET_KEY,
@@ -26,5 +56,6 @@ def get_email_from_jwt_token(token: str) -> Optional[str]:
             project_settings.ALGORITHM,
         ],
     )
-    email: str = payload.get("sub", None)
-    return email
+    email: Optional[str] = payload.get("sub", None)
+    expires_at: Optional[float] = payload.get("exp", None)
+    return email, expires_at
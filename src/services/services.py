@@ -2,13 +2,18 @@ from datetime import timedelta
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 from uuid import UUID
 
+from sqlalchemy import Row
+from sqlalchemy import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import Account
 from src.database.models import Payment
 from src.database.models import User
+from src.dependencies import token_cache
+from src.services import caching
 from src.services import hashing
 from src.services import security
 from src.services.dals import AccountDAL
@@ -17,58 +22,96 @@ from src.services.dals import UserDAL
 from src.settings import project_settings
 
 
+# Сроки жизни токенов не меняются во время работы приложения, поэтому вычисляются
+# один раз при импорте модуля
+ACCESS_TOKEN_EXPIRE_TIMEDELTA: timedelta = timedelta(
+    minutes=project_settings.ACCESS_TOKEN_EXPIRE_MINUTES
+)
+REFRESH_TOKEN_EXPIRE_TIMEDELTA: timedelta = timedelta(
+    days=project_settings.REFRESH_TOKEN_EXPIRE_DAYS
+)
+TOKEN_TYPE: str = "bearer"
+
+
 class BaseService:
     """
     Базовый класс для всех сервисов в проекте (то есть классов,
-    реализующих бизнес-логику для соответствующих обработчиков)
+    реализующих бизнес-логику для соответствующих обработчиков). Границы транзакций
+    задаются на уровне методов сервисов, DAL классы транзакции не открывают
     """
 
+    __slots__ = ("db_session", "user_dal")
+
     def __init__(self, db_session: AsyncSession) -> None:
+        self.db_session: AsyncSession = db_session
         self.user_dal: UserDAL = UserDAL(db_session=db_session)
 
+    async def _get_existing_user(
+        self, user_id: int, with_accounts_and_payments: bool = False
+    ) -> User:
+        user: Optional[User] = await self.user_dal.get_user_by_id(
+            user_id=user_id, with_accounts_and_payments=with_accounts_and_payments
+        )
+        if user is None:
+            raise ValueError("User does not exist")
+
+        return user
+
 
 class AuthService(BaseService):
     """
     Сервис для работы с авторизацией и аутентификацией пользователя
     """
 
+    __slots__ = ()
+
     async def login(self, email: str, password: str) -> Dict[str, str]:
-        user: Optional[User] = await self.user_dal.get_user_by_email(email=email)
+        login_attempt: Tuple[str, bytes] = (
+            email,
+            hashing.get_password_fingerprint(password=password),
+        )
+        if login_attempt in caching.failed_logins:
+            raise ValueError("Login attempt has recently failed")
+
+        async with self.db_session.begin():
+            user: Optional[User] = await self.user_dal.get_user_by_email(email=email)
 
         if user is None:
+            caching.failed_logins[login_attempt] = True
             raise ValueError("User does not exist")
 
-        if not hashing.verify_password(
+        if not await hashing.verify_password(
             hashed_password=user.hashed_password, plain_password=password
         ):
+            caching.failed_logins[login_attempt] = True
             raise ValueError("Passwords do not match")
 
         access_token: str = security.create_jwt_token(
             email=user.email,
-            exp_timedelta=timedelta(
-                minutes=project_settings.ACCESS_TOKEN_EXPIRE_MINUTES
-            ),
+            exp_timedelta=ACCESS_TOKEN_EXPIRE_TIMEDELTA,
         )
         refresh_token: str = security.create_jwt_token(
             email=user.email,
-            exp_timedelta=timedelta(days=project_settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            exp_timedelta=REFRESH_TOKEN_EXPIRE_TIMEDELTA,
         )
 
         return {
             "access_token": access_token,
             "refresh_token": refresh_token,
-            "token_type": "bearer",
+            "token_type": TOKEN_TYPE,
         }
 
     @staticmethod
-    def refresh_token(user: User) -> Dict[str, str]:
+    def refresh_token(user: User) -> Dict[str, Optional[str]]:
         new_access_token: str = security.create_jwt_token(
             email=user.email,
-            exp_timedelta=timedelta(
-                minutes=project_settings.ACCESS_TOKEN_EXPIRE_MINUTES
-            ),
+            exp_timedelta=ACCESS_TOKEN_EXPIRE_TIMEDELTA,
         )
-        return {"access_token": new_access_token, "token_type": "bearer"}
+        return {
+            "access_token": new_access_token,
+            "refresh_token": None,
+            "token_type": TOKEN_TYPE,
+        }
 
 
 class UserService(BaseService):
@@ -76,53 +119,84 @@ class UserService(BaseService):
     Сервис для реализации CRUD операций, касающихся пользователя
     """
 
+    __slots__ = ()
+
     async def delete_user(self, user_id: int) -> None:
-        user_for_delete = await self.user_dal.get_user_by_id(user_id=user_id)
+        async with self.db_session.begin():
+            # Удаление каскадно затрагивает счета и платежи пользователя, поэтому они
+            # загружаются заранее
+            user_for_delete: User = await self._get_existing_user(
+                user_id=user_id, with_accounts_and_payments=True
+            )
 
-        if user_for_delete is None:
-            raise ValueError("User does not exist")
+            if user_for_delete.is_admin:
+                raise PermissionError("Cannot delete an admin")
 
-        if user_for_delete.is_admin:
-            raise PermissionError("Cannot delete an admin")
+            await self.user_dal.delete_user(user=user_for_delete)
 
-        await self.user_dal.delete_user(user=user_for_delete)
+        caching.users_by_id.pop(user_id, None)
+        token_cache.invalidate_user(user_id=user_id)
 
     async def create_user(self, email: str, full_name: str, password: str) -> User:
-        new_user = await self.user_dal.create_user(
-            email=email,
-            full_name=full_name,
-            password=hashing.get_password_hash(password),
-        )
+        hashed_password: str = await hashing.get_password_hash(password)
+        async with self.db_session.begin():
+            new_user = await self.user_dal.create_user(
+                email=email, full_name=full_name, hashed_password=hashed_password
+            )
 
         return new_user
 
     async def update_user(
         self, user_id: int, parameters_for_update: Dict[str, str]
     ) -> User:
-        user_for_update = await self.user_dal.get_user_by_id(user_id=user_id)
+        values_for_update: Dict[str, str] = {
+            field: parameters_for_update[field]
+            for field in ("full_name", "email")
+            if parameters_for_update.get(field) is not None
+        }
+        if (password := parameters_for_update.get("password1")) is not None:
+            values_for_update["hashed_password"] = await hashing.get_password_hash(
+                password
+            )
 
-        if user_for_update is None:
-            raise ValueError("User does not exist")
-        if user_for_update.is_admin:
-            raise PermissionError("Cannot update an admin")
+        async with self.db_session.begin():
+            updated_user: Optional[User] = await self.user_dal.update_user(
+                user_id=user_id, values_for_update=values_for_update
+            )
+            # Пользователь проверяется отдельным запросом, только если он не был
+            # обновлен, чтобы вернуть соответствующую ошибку
+            if updated_user is None:
+                await self._get_existing_user(user_id=user_id)
+                raise PermissionError("Cannot update an admin")
 
-        await self.user_dal.update_user(
-            user=user_for_update, parameters_for_update=parameters_for_update
-        )
-        return user_for_update
+        caching.users_by_id.pop(user_id, None)
+        token_cache.invalidate_user(user_id=user_id)
+        return updated_user
 
     async def get_user(self, user_id: int) -> User:
-        user: User = await self.user_dal.get_user_by_id(user_id=user_id)
+        user_fields: Optional[token_cache.UserFields] = None
+        if caching.USER_CACHE_ENABLED:
+            user_fields = caching.users_by_id.get(user_id)
 
-        if user is None:
-            raise ValueError("User does not exist")
+        if user_fields is None:
+            async with self.db_session.begin():
+                user: User = await self._get_existing_user(user_id=user_id)
+
+            user_fields = (user.user_id, user.email, user.full_name, user.is_admin)
+            if caching.USER_CACHE_ENABLED:
+                caching.users_by_id[user_id] = user_fields
+
+        user = token_cache.build_user(user_fields=user_fields)
         if user.is_admin:
             raise PermissionError("Cannot get admin data")
 
         return user
 
-    async def get_users(self) -> List[User]:
-        users: List[User] = await self.user_dal.get_users()
+    async def get_users(self, after_id: int, limit: int) -> List[RowMapping]:
+        async with self.db_session.begin():
+            users: List[RowMapping] = await self.user_dal.get_users(
+                after_id=after_id, limit=limit
+            )
         return users
 
 
@@ -131,29 +205,31 @@ class AccountService(BaseService):
     Сервис для работы со счетами пользователя
     """
 
+    __slots__ = ("account_dal",)
+
     def __init__(self, db_session: AsyncSession):
         super().__init__(db_session=db_session)
         self.account_dal: AccountDAL = AccountDAL(db_session=db_session)
 
-    async def get_current_user_accounts(self, user: User) -> List[Account]:
-        accounts: List[Account] = await self.account_dal.get_accounts_by_user_id(
-            user_id=user.user_id
-        )
-        return accounts
+    async def get_accounts_by_user_id(
+        self, user_id: int, limit: int, offset: int
+    ) -> List[Account]:
+        async with self.db_session.begin():
+            accounts: List[Account] = await self.account_dal.get_accounts_by_user_id(
+                user_id=user_id, limit=limit, offset=offset
+            )
+            # Счета могут быть только у существующего пользователя, не являющегося
+            # администратором, поэтому пользователь проверяется лишь при пустом
+            # результате
+            if accounts:
+                return accounts
 
-    async def get_accounts_by_user_id(self, user_id: int) -> List[Account]:
-        target_user: Optional[User] = await self.user_dal.get_user_by_id(
-            user_id=user_id
-        )
-        if target_user is None:
-            raise ValueError("User does not exist")
-        if target_user.is_admin:
-            raise PermissionError("Admin cannot get another admin data")
+            target_user: User = await self._get_existing_user(user_id=user_id)
 
-        accounts: List[Account] = await self.account_dal.get_accounts_by_user_id(
-            user_id=user_id
-        )
-        return accounts
+            if target_user.is_admin:
+                raise PermissionError("Admin cannot get another admin data")
+
+            return accounts
 
 
 class PaymentService(BaseService):
@@ -161,6 +237,8 @@ class PaymentService(BaseService):
     Сервис для работы с платежами
     """
 
+    __slots__ = ("account_dal", "payment_dal")
+
     def __init__(self, db_session: AsyncSession) -> None:
         super().__init__(db_session=db_session)
         self.account_dal: AccountDAL = AccountDAL(db_session=db_session)
@@ -174,63 +252,64 @@ class PaymentService(BaseService):
         amount: float,
         signature: str,
     ) -> None:
-        await self._check_user(user_id=user_id)
-
-        account: Account = await self._check_account(
-            account_id=account_id, user_id=user_id
-        )
-
-        await self._check_payment(
-            transaction_id=transaction_id,
-            user_id=user_id,
-            account_id=account_id,
-            amount=amount,
-            signature=signature,
-        )
+        # Проверки и запись платежа выполняются в одной транзакции, а все данные
+        # для проверок получаются одним запросом
+        async with self.db_session.begin():
+            preconditions: Row = await self.payment_dal.get_payment_preconditions(
+                transaction_id=transaction_id, user_id=user_id, account_id=account_id
+            )
 
-        if account is None:
-            account: Account = await self.account_dal.create_account(
-                account_id=account_id, user_id=user_id
+            self._check_user(is_admin=preconditions.user_is_admin)
+            self._check_account(
+                user_id=user_id, account_user_id=preconditions.account_user_id
+            )
+            self._check_payment(
+                payment_exists=preconditions.payment_exists,
+                transaction_id=transaction_id,
+                user_id=user_id,
+                account_id=account_id,
+                amount=amount,
+                signature=signature,
             )
 
-        await self.account_dal.change_balance(account=account, amount=amount)
-        await self.payment_dal.add_payment_to_database(
-            transaction_id=transaction_id,
-            account_id=account_id,
-            amount=amount,
-            signature=signature,
-        )
+            # Проверки выше дают понятные ошибки, а условия в запросах защищают от
+            # одновременных платежей, изменивших данные после проверок
+            if not await self.account_dal.add_to_balance(
+                account_id=account_id, user_id=user_id, amount=amount
+            ):
+                raise ValueError("Account does not belong to the specified user")
 
-    async def _check_user(self, user_id: int) -> None:
-        user: Optional[User] = await self.user_dal.get_user_by_id(user_id=user_id)
+            if not await self.payment_dal.add_payment_to_database(
+                transaction_id=transaction_id,
+                account_id=account_id,
+                amount=amount,
+                signature=signature,
+            ):
+                raise ValueError("Transaction with this id already exists")
 
-        if user is None:
+    @staticmethod
+    def _check_user(is_admin: Optional[bool]) -> None:
+        if is_admin is None:
             raise ValueError("User does not exist")
-        if user.is_admin:
-            raise PermissionError("Cannot process a payment if the user is an admin")
 
-    async def _check_account(self, account_id: int, user_id: int) -> Account:
-        account: Optional[Account] = await self.account_dal.get_account_by_id(
-            account_id=account_id
-        )
-        if account is not None:
-            if account.user_id != user_id:
-                raise ValueError("Account does not belong to the specified user")
+        if is_admin:
+            raise PermissionError("Cannot process a payment if the user is an admin")
 
-            return account
+    @staticmethod
+    def _check_account(user_id: int, account_user_id: Optional[int]) -> None:
+        if account_user_id is not None and account_user_id != user_id:
+            raise ValueError("Account does not belong to the specified user")
 
-    async def _check_payment(
-        self,
+    @staticmethod
+    def _check_payment(
+        payment_exists: bool,
         transaction_id: UUID,
         user_id: int,
         account_id: int,
         amount: float,
         signature: str,
     ) -> None:
-        payment: Optional[Payment] = await self.payment_dal.get_payment(
-            transaction_id=transaction_id
-        )
-        if payment is not None:
+        if payment_exists:
             raise ValueError("Transaction with this id already exists")
 
         if not hashing.verify_signature(
@@ -244,20 +323,9 @@ class PaymentService(BaseService):
         ):
             raise ValueError("Signature is incorrect")
 
-    async def get_payments(self, user: User) -> Optional[List[Payment]]:
-        accounts: List[Account] = await self.account_dal.get_accounts_by_user_id(
-            user_id=user.user_id
-        )
-        if not accounts:
-            []
-
-        payments = []
-        for acc in accounts:
-            account_payments: List[
-                Payment
-            ] = await self.payment_dal.get_payments_by_account_id(
-                account_id=acc.account_id
+    async def get_payments(self, user: User) -> List[Payment]:
+        async with self.db_session.begin():
+            payments: List[Payment] = await self.payment_dal.get_payments_by_user_id(
+                user_id=user.user_id
             )
-            payments.extend(account_payments)
-
         return payments
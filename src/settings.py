@@ -19,6 +19,7 @@ class ProjectSettings(BaseSettings):
     APP_TITLE: str
     APP_HOST: str
     APP_PORT: int
+    APP_WORKERS: int = 1
 
     model_config = SettingsConfigDict(
         env_file=os.path.join(